@@ -59,41 +59,85 @@ class IMUSensor:
             self.bno = None
             self.is_initialized = False
     
-    def get_compass_heading(self):
+    def get_compass_heading_radians(self):
         """
-        Get the current compass heading in degrees (0-360)
-        
+        Get the current compass heading in radians (0-2pi)
+
+        The quaternion yaw is computed natively in radians; use this from
+        code that works in radians to skip the degree round-trip.
+
         Returns:
-            float: Compass heading in degrees (0-360) or None if error
+            float: Compass heading in radians (0-2pi) or None if error
         """
         if self.bno is None:
             return None
-        
+
         try:
             # Get rotation vector (quaternion)
             quat_i, quat_j, quat_k, quat_real = self.bno.quaternion
-            
+
             # Convert quaternion to Euler angles
             # Calculate yaw (heading) from quaternion
             yaw = math.atan2(2.0 * (quat_real * quat_k + quat_i * quat_j),
                            1.0 - 2.0 * (quat_j * quat_j + quat_k * quat_k))
-            
-            # Convert from radians to degrees and normalize to 0-360
-            heading = math.degrees(yaw)
-            if heading < 0:
-                heading += 360
-            
-            # Set initial heading on first reading
-            if self.initial_heading is None:
-                self.initial_heading = heading
-            
-            self.current_heading = heading
-            return heading
-            
+
+            # Normalize to 0-2pi
+            if yaw < 0:
+                yaw += 2.0 * math.pi
+
+            return yaw
+
         except Exception as e:
             print(f"Error reading compass heading: {e}")
             return None
-    
+
+    def get_compass_heading(self):
+        """
+        Get the current compass heading in degrees (0-360)
+
+        Returns:
+            float: Compass heading in degrees (0-360) or None if error
+        """
+        yaw = self.get_compass_heading_radians()
+        if yaw is None:
+            return None
+
+        heading = math.degrees(yaw)
+
+        # Set initial heading on first reading
+        if self.initial_heading is None:
+            self.initial_heading = heading
+
+        self.current_heading = heading
+        return heading
+
+    def get_relative_heading_radians(self):
+        """
+        Get heading relative to initial orientation in radians (0-2pi)
+
+        Returns:
+            float: Relative heading in radians (0-2pi) or None if error
+        """
+        if not self.is_available():
+            return None
+
+        current = self.get_compass_heading_radians()
+        if current is None:
+            return None
+
+        # If no initial heading set, set it to current heading
+        if self.initial_heading is None:
+            self.initial_heading = math.degrees(current)
+            print(f"Initial heading set to: {self.initial_heading:.1f}°")
+
+        relative = current - math.radians(self.initial_heading)
+        if relative < 0:
+            relative += 2.0 * math.pi
+        elif relative >= 2.0 * math.pi:
+            relative -= 2.0 * math.pi
+
+        return relative
+
     def get_relative_heading(self):
         """
         Get heading relative to initial orientation (0 = initial direction)
@@ -0,0 +1,1429 @@
+"""
+Localization module for the Soccer Robot
+Triangulates robot position on the field using TOF distances and IMU heading
+"""
+
+import math
+import time
+import logging
+import threading
+import numpy as np
+from scipy.optimize import minimize, dual_annealing
+from config import LOCALIZATION_CONFIG, TOF_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Optional Numba acceleration: a compiled scalar loop beats NumPy dispatch
+# overhead on these tiny (sensors x walls) arrays. The NumPy paths remain
+# the fallback when numba is not installed on the robot.
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _ray_exit_jit(x, y, cos_a, sin_a, field_w, field_h):
+        """Slab-test exit distance of a ray leaving the field rectangle"""
+        best = np.inf
+        if cos_a > 1e-9:
+            best = (field_w - x) / cos_a
+        elif cos_a < -1e-9:
+            best = -x / cos_a
+        if sin_a > 1e-9:
+            t = (field_h - y) / sin_a
+            if t < best:
+                best = t
+        elif sin_a < -1e-9:
+            t = -y / sin_a
+            if t < best:
+                best = t
+        if best < 0:
+            # Origin outside the field - no meaningful boundary hit
+            best = np.inf
+        return best
+
+    @njit(cache=True, fastmath=True)
+    def _raycast_sensors_jit(x, y, cos_w, sin_w, field_w, field_h,
+                             vwall_x, vwall_ymin, vwall_ymax,
+                             hwall_y, hwall_xmin, hwall_xmax):
+        """Compiled per-sensor ray cast against the field walls"""
+        out = np.empty(cos_w.shape[0], dtype=np.float32)
+        for s in range(cos_w.shape[0]):
+            cos_a = cos_w[s]
+            sin_a = sin_w[s]
+            best = _ray_exit_jit(x, y, cos_a, sin_a, field_w, field_h)
+            if abs(cos_a) > 1e-9:
+                for w in range(vwall_x.shape[0]):
+                    t = (vwall_x[w] - x) / cos_a
+                    if t > 0:
+                        hit_y = y + t * sin_a
+                        if hit_y >= vwall_ymin[w] and hit_y <= vwall_ymax[w]:
+                            if t < best:
+                                best = t
+            if abs(sin_a) > 1e-9:
+                for w in range(hwall_y.shape[0]):
+                    t = (hwall_y[w] - y) / sin_a
+                    if t > 0:
+                        hit_x = x + t * cos_a
+                        if hit_x >= hwall_xmin[w] and hit_x <= hwall_xmax[w]:
+                            if t < best:
+                                best = t
+            out[s] = best
+        return out
+
+    @njit(cache=True, fastmath=True)
+    def _position_error_jit(x, y, cos_w, sin_w, actual, valid, field_w, field_h,
+                            vwall_x, vwall_ymin, vwall_ymax,
+                            hwall_y, hwall_xmin, hwall_xmax):
+        """Compiled fused ray cast + mean absolute error, no allocations"""
+        total = 0.0
+        count = 0
+        for s in range(cos_w.shape[0]):
+            if not valid[s]:
+                continue
+            cos_a = cos_w[s]
+            sin_a = sin_w[s]
+            best = _ray_exit_jit(x, y, cos_a, sin_a, field_w, field_h)
+            if abs(cos_a) > 1e-9:
+                for w in range(vwall_x.shape[0]):
+                    t = (vwall_x[w] - x) / cos_a
+                    if t > 0:
+                        hit_y = y + t * sin_a
+                        if hit_y >= vwall_ymin[w] and hit_y <= vwall_ymax[w]:
+                            if t < best:
+                                best = t
+            if abs(sin_a) > 1e-9:
+                for w in range(hwall_y.shape[0]):
+                    t = (hwall_y[w] - y) / sin_a
+                    if t > 0:
+                        hit_x = x + t * cos_a
+                        if hit_x >= hwall_xmin[w] and hit_x <= hwall_xmax[w]:
+                            if t < best:
+                                best = t
+            if best == np.inf:
+                continue
+            total += abs(best - actual[s])
+            count += 1
+        if count == 0:
+            return np.inf
+        return total / count
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _grid_error_jit(xs, ys, cos_w, sin_w, actual, valid, field_w, field_h,
+                        vwall_x, vwall_ymin, vwall_ymax,
+                        hwall_y, hwall_xmin, hwall_xmax):
+        """Compiled position-error grid, parallel over candidates"""
+        out = np.empty(xs.shape[0], dtype=np.float32)
+        for i in prange(xs.shape[0]):
+            out[i] = _position_error_jit(
+                xs[i], ys[i], cos_w, sin_w, actual, valid, field_w, field_h,
+                vwall_x, vwall_ymin, vwall_ymax,
+                hwall_y, hwall_xmin, hwall_xmax)
+        return out
+
+
+# Direction names in 45-degree steps counter-clockwise from straight ahead
+_DIRECTION_NAMES = ("FRONT", "FRONT-RIGHT", "RIGHT", "BACK-RIGHT",
+                    "BACK", "BACK-LEFT", "LEFT", "FRONT-LEFT")
+
+# Field edge order used by get_field_bounds_check's distance array
+EDGE_NAMES = ("left", "right", "bottom", "top")
+
+
+def _direction_name(angle_deg):
+    """
+    Get a human-readable direction name for a sensor angle
+
+    Args:
+        angle_deg: Sensor angle in degrees
+
+    Returns:
+        str: Direction name
+    """
+    # Offset by half a sector so the bucket boundaries land on 22.5 degrees,
+    # then index the table - no comparison ladder
+    return _DIRECTION_NAMES[int(((angle_deg + 22.5) % 360) // 45) % 8]
+
+
+class Localizer:
+    """Estimates robot position on the field from TOF sensor readings"""
+
+    def __init__(self, tof_manager, imu_sensor=None):
+        """
+        Initialize the localizer
+
+        Args:
+            tof_manager: TOFManager instance providing distance readings
+            imu_sensor: Optional IMUSensor instance for heading updates
+        """
+        self.tof_manager = tof_manager
+        self.imu_sensor = imu_sensor
+
+        # Field geometry from config
+        self.field_width = LOCALIZATION_CONFIG["field_width"]
+        self.field_height = LOCALIZATION_CONFIG["field_height"]
+        self.update_frequency = LOCALIZATION_CONFIG["update_frequency"]
+
+        # The field layout is static, so convert the wall dicts once into
+        # structure-of-arrays columns per orientation; nothing downstream
+        # touches the dict form again. The four outer walls form the field
+        # bounding rectangle and are handled by a closed-form slab test, so
+        # only the interior (goal) walls are kept as per-wall tables.
+        walls = LOCALIZATION_CONFIG["walls"]
+        vwalls = [(wall['x'], wall['y_min'], wall['y_max'])
+                  for wall in walls if wall['type'] == 'vertical'
+                  and 0 < wall['x'] < self.field_width]
+        hwalls = [(wall['y'], wall['x_min'], wall['x_max'])
+                  for wall in walls if wall['type'] == 'horizontal'
+                  and 0 < wall['y'] < self.field_height]
+        self._vwall_x, self._vwall_ymin, self._vwall_ymax = (
+            np.array(column, dtype=np.float32) for column in zip(*vwalls))
+        self._hwall_y, self._hwall_xmin, self._hwall_xmax = (
+            np.array(column, dtype=np.float32) for column in zip(*hwalls))
+
+        # Distance limits from config
+        self.max_distance = TOF_CONFIG["max_distance"]
+        self.min_distance = TOF_CONFIG["min_distance"]
+
+        # Field corner vectors for whole-position bounds checks
+        self._field_lo = np.zeros(2, dtype=np.float64)
+        self._field_hi = np.array([self.field_width, self.field_height],
+                                  dtype=np.float64)
+
+        # Reused edge-distance buffer for get_field_bounds_check, ordered
+        # as EDGE_NAMES
+        self._edge_distances = np.zeros(4, dtype=np.float64)
+
+        # Sensor angles are fixed after init - share the manager's
+        # structure-of-arrays geometry views, indexed by sensor ordinal
+        self._sensor_angles = self.tof_manager.sensor_angles_array
+        self._sensor_angles_deg = self.tof_manager.sensor_angles_deg
+
+        # Direction names are a pure function of the fixed sensor angles -
+        # classify each sensor once instead of per telemetry call
+        self._sensor_directions = [_direction_name(angle_deg)
+                                   for angle_deg in self._sensor_angles_deg]
+
+        # World-frame ray direction cache: the heading is fixed for the whole
+        # of one optimization pass, so cos/sin of (heading + sensor angles)
+        # are computed once per heading rather than once per error evaluation
+        self._trig_angle = None
+        self._cos_world = None
+        self._sin_world = None
+
+        # Position state (mm, field coordinates with origin at bottom-left corner)
+        self.position = [self.field_width / 2, self.field_height / 2]
+        self.angle = 0.0  # Robot heading in radians
+        self._angle_deg = 0.0  # Cached degree value, updated alongside self.angle
+        self.confidence = 0.0
+        self.initialized = False
+
+        # Position smoothing: linear recency weights, precomputed with their
+        # partial sums so each tick is two dot products and one divide.
+        # History lives in a preallocated ring buffer - no per-tick list
+        # allocations or O(n) front-pops
+        self.history_length = 5
+        self._smooth_weights = np.arange(1, self.history_length + 1, dtype=np.float64)
+        self._smooth_weight_sums = np.cumsum(self._smooth_weights)
+        self._hist_pos = np.zeros((self.history_length, 2), dtype=np.float64)
+        self._hist_head = -1
+        self._hist_count = 0
+        self._hist_idx = np.arange(self.history_length)
+        # Double-buffered smoothing output: the writer fills the buffer that
+        # self.position does NOT currently point at, so snapshot readers
+        # under the position lock never see a half-written update
+        self._smooth_buffers = ([0.0, 0.0], [0.0, 0.0])
+        self._smooth_idx = 0
+
+        # Per-frame position delta, used to predict the next seed
+        self._last_delta = [0.0, 0.0]
+
+        # Background localization thread state
+        self.running = False
+        self._update_thread = None
+        self._position_lock = threading.Lock()
+
+        # Grid step for the initial (no prior) search; the candidate grid
+        # spans the whole field, with infeasible cells pruned before any
+        # error evaluation
+        self.grid_size = 50       # Grid step in mm
+
+        # Refinement parameters (millimetre-level convergence)
+        self.refine_maxfev = 60    # Cap on error evaluations per refinement
+        self.accept_error = 30.0   # Skip refinement below this error in mm
+
+        # Optional precomputed (x, y, angle) distance table: opt-in via
+        # enable_distance_lut(), trades a few MB for table lookups in place
+        # of exact ray casts on the interpreter fallback path
+        self.use_distance_lut = False
+        self._dist_lut = None
+        self.lut_grid_size = 50.0                 # mm per position sample
+        self.lut_angle_step = math.radians(2.0)   # radians per angle sample
+
+        # Single-slot error memo, keyed by quantized position/heading and
+        # the TOF manager's reading version
+        self._error_cache_key = None
+        self._error_cache_value = None
+
+        # Tile cache for the global search objective, keyed by quantized
+        # (x, y, heading bucket); cleared whenever the readings change
+        # (tracked via the manager's version counter)
+        self._tile_cache = {}
+        self._tile_cache_version = -1
+        self.tile_size = 10            # Cache tile edge in mm
+        self.tile_cache_limit = 10000  # Entries before oldest-first eviction
+
+        # Cached test_localization_system results, keyed by heading quantized
+        # to whole degrees (test positions and walls are static)
+        self._test_position_cache = {}
+
+        # Validity mask over the measured distances, refreshed once per
+        # localize() call and reused across every error evaluation
+        self._valid_mask = np.zeros(self.tof_manager.get_sensor_count(), dtype=bool)
+
+        # Motion short-circuit state: skip re-triangulation when neither the
+        # heading nor the TOF readings have changed meaningfully
+        self._last_distances = None
+        self._last_angle = 0.0
+        self._frames_since_full_localize = 0
+        self.angle_motion_threshold = 0.01   # radians
+        self.distance_motion_threshold = 20  # mm
+        self.force_localize_interval = 10    # Frames between forced re-localizations
+
+        # Extended Kalman filter tracker state: covariance is seeded after
+        # each full geometric fix and None forces re-acquisition
+        self._kf_P = None
+        self.kf_process_noise = 25.0       # Q diagonal in mm^2 per tick
+        self.kf_measurement_noise = 900.0  # R diagonal in mm^2 (~30 mm sensor sigma)
+        self.kf_innovation_limit = 200.0   # Mean innovation in mm that triggers re-acquisition
+
+        # Warm the JIT kernels with throwaway calls so the first localize()
+        # in the control loop does not absorb the compile time
+        if HAS_NUMBA:
+            self._warm_jit_kernels()
+
+    def _warm_jit_kernels(self):
+        """Trigger Numba compilation of the ray and error kernels"""
+        cos_w, sin_w = self._world_trig(0.0)
+        field_w = float(self.field_width)
+        field_h = float(self.field_height)
+        n_sensors = len(self._sensor_angles)
+
+        _raycast_sensors_jit(
+            float(self.position[0]), float(self.position[1]),
+            cos_w, sin_w, field_w, field_h,
+            self._vwall_x, self._vwall_ymin, self._vwall_ymax,
+            self._hwall_y, self._hwall_xmin, self._hwall_xmax)
+
+        # One grid call compiles the candidate loop plus the scalar error
+        # and ray-exit kernels it inlines
+        _grid_error_jit(
+            np.full(1, self.position[0], dtype=np.float32),
+            np.full(1, self.position[1], dtype=np.float32),
+            cos_w, sin_w,
+            np.zeros(n_sensors, dtype=np.float32),
+            np.zeros(n_sensors, dtype=bool),
+            field_w, field_h,
+            self._vwall_x, self._vwall_ymin, self._vwall_ymax,
+            self._hwall_y, self._hwall_xmin, self._hwall_xmax)
+
+    def localize(self):
+        """
+        Run one localization update
+
+        Updates sensor distances, refreshes the heading from the IMU and
+        triangulates the robot position from wall distances.
+
+        Returns:
+            list: Estimated [x, y] position in mm
+        """
+        # Refresh sensor readings and the per-frame validity mask - the mask
+        # never changes during one optimization pass
+        self.tof_manager.update_distances()
+        distances = self.tof_manager.distances_array
+        self._valid_mask = ((distances >= self.min_distance) &
+                            (distances <= self.max_distance))
+
+        # Update heading from IMU if available
+        self._update_angle_from_imu()
+
+        # Short-circuit if nothing has moved since the last full localization,
+        # with a periodic forced re-localization to prevent drift lock-in
+        if (self.initialized and self._last_distances is not None and
+                self._frames_since_full_localize < self.force_localize_interval and
+                abs(self.angle - self._last_angle) < self.angle_motion_threshold and
+                np.max(np.abs(distances - self._last_distances)) < self.distance_motion_threshold):
+            self._frames_since_full_localize += 1
+            return list(self.position)
+
+        self._last_distances = distances.copy()
+        self._last_angle = self.angle
+        self._frames_since_full_localize = 0
+
+        # Triangulate position from wall distances
+        new_position = self._triangulate_position()
+
+        if new_position is not None:
+            smoothed = self._apply_smoothing(new_position)
+            with self._position_lock:
+                delta = [smoothed[0] - self.position[0],
+                         smoothed[1] - self.position[1]]
+                # Only tracked motion may seed the next frame: the first
+                # fix measures distance from the default initialization,
+                # and a re-acquisition jump measures the jump itself -
+                # feeding either into the warm start and the EKF predict
+                # launches the estimate in a made-up direction
+                if (not self.initialized or
+                        math.hypot(delta[0], delta[1]) > self.kf_innovation_limit):
+                    delta = [0.0, 0.0]
+                self._last_delta = delta
+                self.position = smoothed
+            self.initialized = True
+            logger.debug("Localized at (%.0f, %.0f) confidence %.2f",
+                         self.position[0], self.position[1], self.confidence)
+        else:
+            logger.debug("Localization failed - keeping previous position")
+
+        # Defensive copy, as on the short-circuit path: self.position points
+        # into the smoothing double-buffer, which a later update overwrites
+        return list(self.position)
+
+    def start_background_localization(self):
+        """
+        Start running localization updates on a background thread
+
+        The optimization runs at the configured update frequency without
+        blocking the caller; use get_position() for thread-safe snapshots
+        of the latest estimate.
+        """
+        if self._update_thread is not None and self._update_thread.is_alive():
+            return
+
+        self.running = True
+        self._update_thread = threading.Thread(target=self._localization_loop, daemon=True)
+        self._update_thread.start()
+        print("Background localization started")
+
+    def stop_background_localization(self):
+        """Stop the background localization thread"""
+        self.running = False
+        if self._update_thread is not None:
+            self._update_thread.join(timeout=1.0)
+            self._update_thread = None
+
+    def _localization_loop(self):
+        """Background loop running localization at the update frequency"""
+        while self.running:
+            start_time = time.monotonic()
+            try:
+                self.localize()
+            except Exception as e:
+                logger.debug("Background localization update failed: %s", e)
+            # Sleep out the remainder of the update period
+            elapsed = time.monotonic() - start_time
+            if elapsed < self.update_frequency:
+                time.sleep(self.update_frequency - elapsed)
+
+    def get_position(self):
+        """
+        Get a thread-safe snapshot of the latest position estimate
+
+        Returns:
+            tuple: ([x, y] position in mm, heading in radians, confidence)
+        """
+        with self._position_lock:
+            return list(self.position), self.angle, self.confidence
+
+    def _update_angle_from_imu(self):
+        """Update the robot heading from the IMU relative heading"""
+        if self.imu_sensor is None or not self.imu_sensor.is_available():
+            return
+
+        relative_heading = self.imu_sensor.get_relative_heading_radians()
+        if relative_heading is not None:
+            self.angle = relative_heading
+            self._angle_deg = math.degrees(relative_heading)
+        else:
+            logger.debug("IMU heading unavailable - keeping previous angle")
+
+    def _triangulate_position(self):
+        """
+        Triangulate robot position from current sensor readings
+
+        Returns:
+            list: [x, y] position in mm, or None if triangulation failed
+        """
+        # Need enough valid readings to triangulate
+        valid_count = int(self._valid_mask.sum())
+
+        if valid_count < 3:
+            logger.debug("Not enough valid sensors for triangulation (%d/3)", valid_count)
+            return None
+
+        # Steady-state tracking runs through the Kalman update - one linear
+        # solve per tick instead of an optimizer run. Acquisition, and any
+        # tick where the innovation spikes (kidnapped robot), falls back to
+        # the full geometric search
+        position = None
+        if self.initialized and self._kf_P is not None:
+            position = self._ekf_update()
+
+        if position is None:
+            position = self._solve_position_from_sensors_geometric()
+            if position is not None:
+                # Re-seed the filter covariance from the refiner's error
+                self._kf_P = np.eye(2) * max(self.kf_measurement_noise,
+                                             (1.0 - self.confidence) * 1e4)
+                # A re-acquisition far from the previous estimate must reach
+                # consumers immediately: averaging it with history from the
+                # old basin would publish positions that lie in neither for
+                # history_length frames
+                if (self.initialized and
+                        math.hypot(position[0] - self.position[0],
+                                   position[1] - self.position[1])
+                        > self.kf_innovation_limit):
+                    self._hist_head = -1
+                    self._hist_count = 0
+
+        if position is not None:
+            logger.debug("Triangulated position: (%.0f, %.0f)", position[0], position[1])
+        else:
+            logger.debug("Triangulation failed - no position found")
+
+        return position
+
+    def _ekf_update(self, eps=2.0):
+        """
+        Run one extended Kalman filter update of the position estimate
+
+        Predicts forward by the last frame's motion, then corrects against
+        the measured distances using a finite-difference Jacobian of the
+        expected readings - three ray casts and one small linear solve,
+        instead of an optimizer run.
+
+        Args:
+            eps: Finite-difference step for the Jacobian in mm
+
+        Returns:
+            list: Updated [x, y] position in mm, or None to force a full
+                geometric search
+        """
+        # Predict: step forward by the last frame's motion, grow covariance
+        pred_x = min(max(self.position[0] + self._last_delta[0], 0.0), self.field_width)
+        pred_y = min(max(self.position[1] + self._last_delta[1], 0.0), self.field_height)
+        covariance = self._kf_P + np.eye(2) * self.kf_process_noise
+
+        measured = self.tof_manager.distances_array
+        h0 = self._cast_sensor_rays([pred_x, pred_y])
+        hx = self._cast_sensor_rays([pred_x + eps, pred_y])
+        hy = self._cast_sensor_rays([pred_x, pred_y + eps])
+        usable = (self._valid_mask & np.isfinite(h0) &
+                  np.isfinite(hx) & np.isfinite(hy))
+        if int(usable.sum()) < 3:
+            return None
+
+        innovation = (measured - h0)[usable].astype(np.float64)
+        mean_innovation = float(np.abs(innovation).mean())
+        if mean_innovation > self.kf_innovation_limit:
+            # Kidnapped-robot case: the prediction disagrees badly with the
+            # sensors, so drop the filter and re-acquire globally
+            logger.debug("EKF innovation spike (%.0f mm) - re-acquiring", mean_innovation)
+            self._kf_P = None
+            return None
+
+        jacobian = np.stack([(hx - h0)[usable],
+                             (hy - h0)[usable]], axis=1).astype(np.float64) / eps
+        innovation_cov = (jacobian @ covariance @ jacobian.T +
+                          np.eye(innovation.shape[0]) * self.kf_measurement_noise)
+        try:
+            gain = covariance @ jacobian.T @ np.linalg.inv(innovation_cov)
+        except np.linalg.LinAlgError:
+            return None
+
+        self._kf_P = (np.eye(2) - gain @ jacobian) @ covariance
+        update = gain @ innovation
+        x = min(max(pred_x + float(update[0]), 0.0), self.field_width)
+        y = min(max(pred_y + float(update[1]), 0.0), self.field_height)
+
+        # Score the corrected estimate the same way the refiner does
+        error = self._calculate_position_error([x, y])
+        if error is None:
+            return None
+        self.confidence = max(0.0, 1.0 - error / self.max_distance)
+
+        return [x, y]
+
+    def _solve_position_from_sensors_geometric(self):
+        """
+        Solve for position from the current sensor readings
+
+        Seeds from the last known position when available (the robot barely
+        moves between updates), otherwise runs a coarse grid search around
+        the field centre, then refines the seed with a simplex search.
+
+        Returns:
+            list: [x, y] position in mm, or None if no position was found
+        """
+        if self.initialized:
+            # Predict forward by the last frame's motion, and start the
+            # simplex small when the previous fix was already confident
+            seed = [self.position[0] + self._last_delta[0],
+                    self.position[1] + self._last_delta[1]]
+            step = 10.0 if self.confidence > 0.7 else 50.0
+        else:
+            seed = self._coarse_grid_seed()
+            if seed is None:
+                return None
+            # The rectangular field is nearly symmetric, so different
+            # positions can produce similar TOF signatures - anneal globally
+            # before trusting the first fix
+            seed = self._global_anneal(seed)
+            step = 50.0
+
+        return self._refine_position(seed, step)
+
+    def _position_objective(self, candidate):
+        """
+        Error objective over a candidate position, clipped to the field
+
+        Args:
+            candidate: Candidate (x, y) position in mm
+
+        Returns:
+            float: Position error in mm (inf when no sensors are usable)
+        """
+        x = min(max(candidate[0], 0.0), self.field_width)
+        y = min(max(candidate[1], 0.0), self.field_height)
+        error = self._calculate_position_error([x, y])
+        return error if error is not None else float('inf')
+
+    def _tiled_objective(self, candidate):
+        """
+        Tile-cached error objective for the global search
+
+        Quantizes candidates to tile_size tiles and an angle bucket so
+        repeated probes of the same region within one annealing run reuse
+        the computed error. The cache is dropped whenever the TOF manager
+        publishes new readings - a tile's error is only valid against the
+        measurements it was computed from. Only the global search uses
+        this: the refiner needs the exact objective for its
+        finite-difference gradients.
+
+        Args:
+            candidate: Candidate (x, y) position in mm
+
+        Returns:
+            float: Position error in mm for the candidate's tile
+        """
+        if self._tile_cache_version != self.tof_manager.version:
+            self._tile_cache.clear()
+            self._tile_cache_version = self.tof_manager.version
+
+        key = (int(candidate[0] / self.tile_size),
+               int(candidate[1] / self.tile_size),
+               int(self.angle * 256.0 / math.pi))
+        cached = self._tile_cache.get(key)
+        if cached is not None:
+            return cached
+
+        error = self._position_objective(candidate)
+        if len(self._tile_cache) >= self.tile_cache_limit:
+            # Drop the oldest entry; stale tiles age out naturally
+            self._tile_cache.pop(next(iter(self._tile_cache)))
+        self._tile_cache[key] = error
+        return error
+
+    def _global_anneal(self, seed):
+        """
+        Run a short simulated-annealing pass over the whole field
+
+        Accepts occasional uphill moves, so it can escape the local minima
+        that a greedy search falls into on a symmetric field.
+
+        Args:
+            seed: Starting [x, y] position in mm
+
+        Returns:
+            list: Best [x, y] found in mm (the seed if annealing did no better)
+        """
+        # Fixed RNG seed: acquisition results become reproducible from the
+        # same readings, which the off-robot test harness relies on
+        result = dual_annealing(self._tiled_objective,
+                                bounds=[(0.0, self.field_width),
+                                        (0.0, self.field_height)],
+                                x0=np.array(seed, dtype=float),
+                                seed=1,
+                                maxiter=20)
+
+        # Judge the annealer's candidate with the exact objective - the
+        # tiled value is quantized to tile centres and can undercut the
+        # seed's exact error, swapping the search into a worse basin
+        if (np.isfinite(result.fun) and
+                self._position_objective(result.x) < self._position_objective(seed)):
+            return [float(result.x[0]), float(result.x[1])]
+        return seed
+
+    def _coarse_grid_seed(self):
+        """
+        Find a coarse position seed with a vectorized grid search
+
+        Returns:
+            list: Best [x, y] candidate in mm, or None if none was valid
+        """
+        # Build the candidate grid over the whole field - acquisition has no
+        # prior, and a grid centred on one guess misses poses near the far
+        # corners entirely. Feasibility pruning below keeps the cost down.
+        # float32 grids: field coordinates fit well within the 24-bit mantissa
+        # and the narrower lanes double SIMD throughput on the Pi
+        half_step = self.grid_size / 2
+        X, Y = np.meshgrid(
+            np.arange(half_step, self.field_width, self.grid_size, dtype=np.float32),
+            np.arange(half_step, self.field_height, self.grid_size, dtype=np.float32))
+
+        # Prune candidates before evaluating: a position whose nearest wall
+        # is further away than the largest in-range reading would expect
+        # every sensor to see more than was actually measured, so it cannot
+        # win. Interior goal walls count too - treating them as unbounded
+        # lines underestimates the true distance, which only keeps extra
+        # candidates, never drops a feasible one. One grid step of slack
+        # absorbs quantization.
+        distances = self.tof_manager.distances_array
+        max_valid = float(distances[self._valid_mask].max())
+        nearest_wall = np.minimum(np.minimum(X, self.field_width - X),
+                                  np.minimum(Y, self.field_height - Y))
+        nearest_wall = np.minimum(
+            nearest_wall, np.abs(X[..., None] - self._vwall_x).min(axis=-1))
+        nearest_wall = np.minimum(
+            nearest_wall, np.abs(Y[..., None] - self._hwall_y).min(axis=-1))
+        feasible = ((X >= 0) & (X <= self.field_width) &
+                    (Y >= 0) & (Y <= self.field_height) &
+                    (nearest_wall <= max_valid + self.grid_size))
+        if not feasible.any():
+            return None
+
+        xs = np.ascontiguousarray(X[feasible])
+        ys = np.ascontiguousarray(Y[feasible])
+
+        if HAS_NUMBA:
+            # Parallel compiled kernel: one candidate per prange iteration,
+            # the inner sensor x wall loops stay in registers
+            cos_w, sin_w = self._world_trig(self.angle)
+            errors = _grid_error_jit(
+                xs, ys,
+                cos_w, sin_w, distances, self._valid_mask,
+                float(self.field_width), float(self.field_height),
+                self._vwall_x, self._vwall_ymin, self._vwall_ymax,
+                self._hwall_y, self._hwall_xmin, self._hwall_xmax)
+        else:
+            errors = self._calculate_position_error_grid(xs, ys)
+        if errors is None:
+            return None
+
+        best_index = int(np.argmin(errors))
+        if not np.isfinite(errors[best_index]):
+            return None
+
+        return [float(xs[best_index]), float(ys[best_index])]
+
+    def _refine_position(self, seed, step=50.0):
+        """
+        Refine a position seed with a bounded quasi-Newton search
+
+        Finite-difference gradients use the error magnitude as well as its
+        direction, so convergence takes fewer evaluations than stepping a
+        grid or reflecting a simplex.
+
+        Args:
+            seed: Starting [x, y] position in mm
+            step: Expected position uncertainty in mm; scales the
+                finite-difference step
+
+        Returns:
+            list: Refined [x, y] position in mm, or None if refinement failed
+        """
+        # When the warm-started seed is already within the acceptance error,
+        # further refinement buys nothing measurable - take it as-is
+        seed_error = self._position_objective(seed)
+        if seed_error < self.accept_error:
+            self.confidence = max(0.0, 1.0 - seed_error / self.max_distance)
+            x = min(max(float(seed[0]), 0.0), self.field_width)
+            y = min(max(float(seed[1]), 0.0), self.field_height)
+            return [x, y]
+
+        result = minimize(self._position_objective, seed, method='L-BFGS-B',
+                          bounds=[(0.0, self.field_width),
+                                  (0.0, self.field_height)],
+                          options={'maxfun': self.refine_maxfev,
+                                   'eps': max(1.0, 0.1 * step)})
+
+        if not np.isfinite(result.fun):
+            return None
+
+        x = min(max(float(result.x[0]), 0.0), self.field_width)
+        y = min(max(float(result.x[1]), 0.0), self.field_height)
+
+        # One Gauss-Newton step on the per-sensor residual vector polishes
+        # below the optimizer's finite-difference resolution for three more
+        # ray casts
+        polished, polished_error = self._gauss_newton_step([x, y], result.fun)
+
+        # Convert error (mm) to a 0-1 confidence value
+        self.confidence = max(0.0, 1.0 - polished_error / self.max_distance)
+        return polished
+
+    def _gauss_newton_step(self, position, error, eps=2.0):
+        """
+        Take one Gauss-Newton step over the per-sensor residuals
+
+        Forms the finite-difference Jacobian of the expected distances from
+        two extra ray casts and solves the 2D least-squares update, instead
+        of probing a grid around the current estimate.
+
+        Args:
+            position: Current [x, y] position in mm
+            error: Current position error in mm
+            eps: Finite-difference step in mm
+
+        Returns:
+            tuple: (updated [x, y] position, its error in mm); the inputs
+                are returned unchanged when the step does not improve
+        """
+        measured = self.tof_manager.distances_array
+        e0 = self._cast_sensor_rays(position)
+        ex = self._cast_sensor_rays([position[0] + eps, position[1]])
+        ey = self._cast_sensor_rays([position[0], position[1] + eps])
+
+        usable = (self._valid_mask & np.isfinite(e0) &
+                  np.isfinite(ex) & np.isfinite(ey))
+        if int(usable.sum()) < 2:
+            return position, error
+
+        residuals = (e0 - measured)[usable].astype(np.float64)
+        jacobian = np.stack([(ex - e0)[usable],
+                             (ey - e0)[usable]], axis=1).astype(np.float64) / eps
+
+        delta, _, rank, _ = np.linalg.lstsq(jacobian, -residuals, rcond=None)
+        if rank < 2 or not np.all(np.isfinite(delta)):
+            return position, error
+
+        candidate = [min(max(position[0] + float(delta[0]), 0.0), self.field_width),
+                     min(max(position[1] + float(delta[1]), 0.0), self.field_height)]
+        candidate_error = self._position_objective(candidate)
+        if candidate_error < error:
+            return candidate, candidate_error
+        return position, error
+
+    def _calculate_position_error_grid(self, X, Y):
+        """
+        Calculate position errors for a whole grid of candidates at once
+
+        Fuses the ray cast and the error accumulation: per sensor, the
+        expected-distance grid is folded straight into the running error sum,
+        so no (grid, grid, sensors) tensor is ever materialized.
+
+        Args:
+            X: Array of candidate x coordinates in mm
+            Y: Array of candidate y coordinates in mm
+
+        Returns:
+            ndarray: Mean absolute error per candidate in mm, or None if no
+                valid sensors
+        """
+        error_sum = np.zeros_like(X)
+        valid_count = 0
+
+        # Hoist attribute chains out of the sensor loop - each dotted lookup
+        # is a LOAD_ATTR per iteration in CPython
+        valid_mask = self._valid_mask
+        distances = self.tof_manager.distances_array
+        ray_cast = self._ray_cast_grid
+        robot_angle = self.angle
+
+        for sensor in self.tof_manager.sensors:
+            if not valid_mask[sensor.index]:
+                continue
+
+            measured = distances[sensor.index]
+            expected = ray_cast(X, Y, robot_angle + sensor.angle)
+            error_sum += np.abs(expected - measured)
+            valid_count += 1
+
+        if valid_count == 0:
+            return None
+
+        return error_sum / valid_count
+
+    def _ray_cast_grid(self, X, Y, angle):
+        """
+        Cast one ray direction from a grid of origins against all walls
+
+        Args:
+            X: Array of ray origin x coordinates in mm
+            Y: Array of ray origin y coordinates in mm
+            angle: Ray direction in radians
+
+        Returns:
+            ndarray: Distance to the nearest wall per origin in mm (inf where
+                the ray hits nothing)
+        """
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+
+        # Field-boundary exit distances via the slab test
+        if cos_a > 1e-9:
+            t_x = (self.field_width - X) / cos_a
+        elif cos_a < -1e-9:
+            t_x = -X / cos_a
+        else:
+            t_x = np.full_like(X, np.inf)
+        if sin_a > 1e-9:
+            t_y = (self.field_height - Y) / sin_a
+        elif sin_a < -1e-9:
+            t_y = -Y / sin_a
+        else:
+            t_y = np.full_like(Y, np.inf)
+        exit_t = np.minimum(t_x, t_y)
+        exit_t = np.where(exit_t < 0, np.inf, exit_t)
+
+        # Collect the masked t-values per interior wall, then reduce once with
+        # walls on the innermost axis so the min runs over contiguous memory.
+        # Wall arrays and np helpers are hoisted to locals for the loops
+        t_per_wall = [exit_t]
+        where = np.where
+        inf = np.inf
+
+        if abs(cos_a) >= 1e-9:
+            vwall_x, vwall_ymin, vwall_ymax = self._vwall_x, self._vwall_ymin, self._vwall_ymax
+            for w in range(vwall_x.shape[0]):
+                t = (vwall_x[w] - X) / cos_a
+                hit_y = Y + t * sin_a
+                hit = (t > 0) & (hit_y >= vwall_ymin[w]) & (hit_y <= vwall_ymax[w])
+                t_per_wall.append(where(hit, t, inf))
+
+        if abs(sin_a) >= 1e-9:
+            hwall_y, hwall_xmin, hwall_xmax = self._hwall_y, self._hwall_xmin, self._hwall_xmax
+            for w in range(hwall_y.shape[0]):
+                t = (hwall_y[w] - Y) / sin_a
+                hit_x = X + t * cos_a
+                hit = (t > 0) & (hit_x >= hwall_xmin[w]) & (hit_x <= hwall_xmax[w])
+                t_per_wall.append(where(hit, t, inf))
+
+        return np.stack(t_per_wall, axis=-1).min(axis=-1)
+
+    def _calculate_position_error(self, position):
+        """
+        Calculate mean absolute error between expected and measured distances
+
+        Args:
+            position: Candidate [x, y] position in mm
+
+        Returns:
+            float: Mean absolute error in mm, or None if no valid sensors
+        """
+        # Single-slot memo: the refiner and the polish step both re-evaluate
+        # the position they were handed, and the readings only change when
+        # the manager bumps its version
+        key = (round(position[0], 1), round(position[1], 1),
+               round(self.angle, 4), self.tof_manager.version)
+        if key == self._error_cache_key:
+            return self._error_cache_value
+
+        measured = self.tof_manager.distances_array
+
+        if HAS_NUMBA:
+            # Fused kernel: ray cast and error accumulate into one scalar
+            # without intermediate arrays - this runs once per optimizer step
+            cos_w, sin_w = self._world_trig(self.angle)
+            error = _position_error_jit(
+                float(position[0]), float(position[1]),
+                cos_w, sin_w, measured, self._valid_mask,
+                float(self.field_width), float(self.field_height),
+                self._vwall_x, self._vwall_ymin, self._vwall_ymax,
+                self._hwall_y, self._hwall_xmin, self._hwall_xmax)
+            result = float(error) if np.isfinite(error) else None
+        else:
+            if self.use_distance_lut and self._dist_lut is not None:
+                expected = self._lut_expected(position)
+            else:
+                expected = self._cast_sensor_rays(position)
+            usable = self._valid_mask & np.isfinite(expected)
+            if usable.any():
+                result = float(np.abs(expected - measured)[usable].mean())
+            else:
+                result = None
+
+        self._error_cache_key = key
+        self._error_cache_value = result
+        return result
+
+    def enable_distance_lut(self):
+        """
+        Switch error evaluation to the precomputed distance lookup table
+
+        Builds the (x, y, angle) table on first use - exact ray casting
+        stays available for calibration and the test helpers, which bypass
+        the LUT.
+        """
+        if self._dist_lut is None:
+            self._build_distance_lut()
+        self.use_distance_lut = True
+
+    def _build_distance_lut(self):
+        """Sample expected wall distances over a (x, y, angle) grid"""
+        nx = int(self.field_width / self.lut_grid_size) + 1
+        ny = int(self.field_height / self.lut_grid_size) + 1
+        na = int(round(2.0 * math.pi / self.lut_angle_step))
+
+        # Actual sample spacing (the field size is not an exact multiple of
+        # the requested grid size)
+        self._lut_dx = self.field_width / (nx - 1)
+        self._lut_dy = self.field_height / (ny - 1)
+
+        xs = np.linspace(0.0, self.field_width, nx, dtype=np.float32)
+        ys = np.linspace(0.0, self.field_height, ny, dtype=np.float32)
+        X, Y = np.meshgrid(xs, ys, indexing='ij')
+
+        # float16 storage: millimetre distances under 4 m stay within half
+        # precision's resolution (~2 mm at the far wall, under sensor noise),
+        # and the table halves its footprint and bandwidth
+        lut = np.empty((nx, ny, na), dtype=np.float16)
+        for a in range(na):
+            lut[:, :, a] = self._ray_cast_grid(X, Y, a * self.lut_angle_step).astype(np.float16)
+        self._dist_lut = lut
+        logger.debug("Distance LUT built: %dx%dx%d samples (%.1f MB)",
+                     nx, ny, na, lut.nbytes / 1e6)
+
+    def _lut_expected(self, position, angle=None):
+        """
+        Interpolate expected sensor distances from the precomputed table
+
+        Args:
+            position: Ray origin [x, y] in mm
+            angle: Robot heading in radians (defaults to the current heading)
+
+        Returns:
+            ndarray: Interpolated distance per sensor in mm
+        """
+        if angle is None:
+            angle = self.angle
+        lut = self._dist_lut
+        nx, ny, na = lut.shape
+
+        # Fractional indices: bilinear in position, linear-with-wraparound
+        # in ray angle
+        fx = min(max(position[0] / self._lut_dx, 0.0), nx - 1.000001)
+        fy = min(max(position[1] / self._lut_dy, 0.0), ny - 1.000001)
+        x0 = int(fx)
+        y0 = int(fy)
+        tx = np.float32(fx - x0)
+        ty = np.float32(fy - y0)
+
+        fa = ((angle + self._sensor_angles) % (2.0 * np.float32(math.pi))) / np.float32(self.lut_angle_step)
+        a0 = fa.astype(np.intp) % na
+        a1 = (a0 + 1) % na
+        ta = (fa - np.floor(fa)).astype(np.float32)
+
+        def bilinear(a_idx):
+            # Accumulate in float32 - blending in half precision would lose
+            # the sub-millimetre interpolation detail
+            return ((1 - tx) * (1 - ty) * lut[x0, y0, a_idx].astype(np.float32) +
+                    tx * (1 - ty) * lut[x0 + 1, y0, a_idx].astype(np.float32) +
+                    (1 - tx) * ty * lut[x0, y0 + 1, a_idx].astype(np.float32) +
+                    tx * ty * lut[x0 + 1, y0 + 1, a_idx].astype(np.float32))
+
+        return (1 - ta) * bilinear(a0) + ta * bilinear(a1)
+
+    def _cast_sensor_rays(self, position, angle=None):
+        """
+        Cast every sensor ray from one position in a single batched call
+
+        Args:
+            position: Ray origin [x, y] in mm
+            angle: Robot heading in radians (defaults to the current heading)
+
+        Returns:
+            ndarray: Distance to the nearest wall per sensor in mm, indexed by
+                sensor ordinal (inf where the ray hits nothing)
+        """
+        if angle is None:
+            angle = self.angle
+        x, y = position
+
+        cos_w, sin_w = self._world_trig(angle)
+
+        if HAS_NUMBA:
+            return _raycast_sensors_jit(
+                float(x), float(y), cos_w, sin_w,
+                float(self.field_width), float(self.field_height),
+                self._vwall_x, self._vwall_ymin, self._vwall_ymax,
+                self._hwall_y, self._hwall_xmin, self._hwall_xmax)
+
+        # Field-boundary exit distances via the slab test, vectorized over
+        # sensors; the outer walls need no per-wall span checks. Keep the
+        # constants float32 so the whole path stays in narrow lanes.
+        inf32 = np.float32(np.inf)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            limit_x = np.where(cos_w > 0, np.float32(self.field_width), np.float32(0))
+            limit_y = np.where(sin_w > 0, np.float32(self.field_height), np.float32(0))
+            t_x = np.where(np.abs(cos_w) > 1e-9, (limit_x - np.float32(x)) / cos_w, inf32)
+            t_y = np.where(np.abs(sin_w) > 1e-9, (limit_y - np.float32(y)) / sin_w, inf32)
+        exit_t = np.minimum(t_x, t_y)
+        exit_t = np.where(exit_t < 0, inf32, exit_t)
+
+        cos_w = cos_w[:, None]
+        sin_w = sin_w[:, None]
+
+        # (sensors, walls) t-values against the interior walls, with
+        # division-by-zero for parallel rays masked out afterwards
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t_v = (self._vwall_x[None, :] - x) / cos_w
+            hit_y = y + t_v * sin_w
+            valid_v = ((np.abs(cos_w) > 1e-9) & (t_v > 0) &
+                       (hit_y >= self._vwall_ymin) & (hit_y <= self._vwall_ymax))
+
+            t_h = (self._hwall_y[None, :] - y) / sin_w
+            hit_x = x + t_h * cos_w
+            valid_h = ((np.abs(sin_w) > 1e-9) & (t_h > 0) &
+                       (hit_x >= self._hwall_xmin) & (hit_x <= self._hwall_xmax))
+
+        t_all = np.concatenate([np.where(valid_v, t_v, inf32),
+                                np.where(valid_h, t_h, inf32)], axis=1)
+        return np.minimum(exit_t, t_all.min(axis=1))
+
+    def _world_trig(self, angle):
+        """
+        Get cos/sin tables of the world-frame sensor ray directions
+
+        Recomputed only when the heading changes.
+
+        Args:
+            angle: Robot heading in radians
+
+        Returns:
+            tuple: (cos array, sin array) indexed by sensor ordinal
+        """
+        if self._trig_angle != angle:
+            world = angle + self._sensor_angles
+            self._cos_world = np.cos(world)
+            self._sin_world = np.sin(world)
+            self._trig_angle = angle
+        return self._cos_world, self._sin_world
+
+    def _ray_cast_to_walls(self, position, angle):
+        """
+        Cast a ray from a position and find the distance to the nearest wall
+
+        Args:
+            position: Ray origin [x, y] in mm
+            angle: Ray direction in radians
+
+        Returns:
+            float: Distance to the nearest wall in mm, or None if no hit
+        """
+        x, y = position
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+
+        # Closed-form slab test for the field bounding rectangle
+        min_distance = self._field_exit_distance(x, y, cos_a, sin_a)
+
+        # Interior (goal) walls per orientation; rays parallel to a wall
+        # orientation never hit those walls
+        if abs(cos_a) >= 1e-9:
+            t = (self._vwall_x - x) / cos_a
+            hit_y = y + t * sin_a
+            hit = (t > 0) & (hit_y >= self._vwall_ymin) & (hit_y <= self._vwall_ymax)
+            if hit.any():
+                min_distance = min(min_distance, float(t[hit].min()))
+
+        if abs(sin_a) >= 1e-9:
+            t = (self._hwall_y - y) / sin_a
+            hit_x = x + t * cos_a
+            hit = (t > 0) & (hit_x >= self._hwall_xmin) & (hit_x <= self._hwall_xmax)
+            if hit.any():
+                min_distance = min(min_distance, float(t[hit].min()))
+
+        if min_distance == float('inf'):
+            return None
+
+        return min_distance
+
+    def _field_exit_distance(self, x, y, cos_a, sin_a):
+        """
+        Slab-test distance for a ray to exit the field bounding rectangle
+
+        The outer walls span the full field extent, so the exit distance
+        needs no per-wall span checks.
+
+        Args:
+            x, y: Ray origin in mm (inside the field)
+            cos_a, sin_a: Ray direction components
+
+        Returns:
+            float: Exit distance in mm (inf for an origin outside the field)
+        """
+        exit_distance = float('inf')
+        if cos_a > 1e-9:
+            exit_distance = (self.field_width - x) / cos_a
+        elif cos_a < -1e-9:
+            exit_distance = -x / cos_a
+        if sin_a > 1e-9:
+            exit_distance = min(exit_distance, (self.field_height - y) / sin_a)
+        elif sin_a < -1e-9:
+            exit_distance = min(exit_distance, -y / sin_a)
+        if exit_distance < 0:
+            return float('inf')
+        return exit_distance
+
+    def _apply_smoothing(self, new_position):
+        """
+        Smooth a new position estimate against recent history
+
+        Args:
+            new_position: Latest [x, y] estimate in mm
+
+        Returns:
+            list: Smoothed [x, y] position in mm
+        """
+        self._hist_head = (self._hist_head + 1) % self.history_length
+        self._hist_pos[self._hist_head, 0] = new_position[0]
+        self._hist_pos[self._hist_head, 1] = new_position[1]
+        if self._hist_count < self.history_length:
+            self._hist_count += 1
+
+        # Weighted average favouring recent estimates, as one matrix-vector
+        # product against the precomputed weights in oldest-first ring order
+        count = self._hist_count
+        order = (self._hist_head - count + 1 + self._hist_idx[:count]) % self.history_length
+        smoothed = (self._smooth_weights[:count] @ self._hist_pos[order]) / self._smooth_weight_sums[count - 1]
+
+        # Reuse the buffer the current position does not occupy - no list
+        # allocation per tick
+        self._smooth_idx ^= 1
+        out = self._smooth_buffers[self._smooth_idx]
+        out[0] = float(smoothed[0])
+        out[1] = float(smoothed[1])
+        return out
+
+    def get_closest_sensor(self):
+        """
+        Get the sensor currently reading the smallest distance
+
+        Returns:
+            dict: Closest sensor info, or None if no sensors
+        """
+        distances = self.tof_manager.distances_array
+        if distances.size == 0:
+            return None
+
+        # Mask out-of-range readings so a dead sensor reporting 0 never wins
+        masked = np.where((distances >= self.min_distance) &
+                          (distances <= self.max_distance), distances, np.inf)
+        index = int(np.argmin(masked))
+        if not np.isfinite(masked[index]):
+            return None
+
+        closest_sensor = self.tof_manager.sensors[index]
+        return {
+            'address': closest_sensor.address,
+            'angle_degrees': self._sensor_angles_deg[index],
+            'distance': float(distances[index]),
+            'direction': self._sensor_directions[index]
+        }
+
+    def get_sensor_health_status(self):
+        """
+        Get health status for all sensors based on current readings
+
+        Returns:
+            dict: Sensor health summary
+        """
+        healthy_mask = ((self.tof_manager.distances_array >= self.min_distance) &
+                        (self.tof_manager.distances_array <= self.max_distance))
+        healthy_count = int(healthy_mask.sum())
+
+        sensors = []
+        for sensor in self.tof_manager.sensors:
+            sensors.append({
+                'address': sensor.address,
+                'angle_degrees': self._sensor_angles_deg[sensor.index],
+                'distance': self.tof_manager.distances_array[sensor.index],
+                'healthy': bool(healthy_mask[sensor.index])
+            })
+
+        return {
+            'healthy_count': healthy_count,
+            'total_count': self.tof_manager.get_sensor_count(),
+            'sensors': sensors
+        }
+
+    def get_imu_status(self):
+        """
+        Get IMU status information for telemetry
+
+        Returns:
+            dict: IMU availability and heading data
+        """
+        if self.imu_sensor is None or not self.imu_sensor.is_available():
+            return {
+                'available': False,
+                'heading_degrees': None,
+                'robot_angle_degrees': self._angle_deg
+            }
+
+        return {
+            'available': True,
+            'heading_degrees': self.imu_sensor.get_relative_heading(),
+            'robot_angle_degrees': self._angle_deg
+        }
+
+    def validate_localization(self):
+        """
+        Validate the current position estimate
+
+        Returns:
+            dict: Validation result with per-check details
+        """
+        position = np.asarray(self.position)
+        in_bounds = bool(np.all((position >= self._field_lo) &
+                                (position <= self._field_hi)))
+
+        # Count in-range sensors with one vectorized range check
+        distances = self.tof_manager.distances_array
+        valid_sensors = int(((distances >= self.min_distance) &
+                             (distances <= self.max_distance)).sum())
+
+        return {
+            'valid': in_bounds and valid_sensors >= 3,
+            'in_bounds': in_bounds,
+            'valid_sensors': valid_sensors,
+            'confidence': self.confidence
+        }
+
+    def get_field_bounds_check(self):
+        """
+        Get the distance from the current position to each field edge
+
+        Returns:
+            dict: within_bounds flag and edge distances in mm, ordered
+                left, right, bottom, top (see EDGE_NAMES). The distance
+                array is a reused buffer - copy it to keep it across calls
+        """
+        x, y = self.position
+        edges = self._edge_distances
+        edges[0] = x
+        edges[1] = self.field_width - x
+        edges[2] = y
+        edges[3] = self.field_height - y
+        return {
+            'within_bounds': bool(np.all(edges >= 0)),
+            'distance_to_edges': edges
+        }
+
+    def get_localization_debug_info(self):
+        """
+        Get detailed localization state for debugging
+
+        Returns:
+            dict: Current position, angle, confidence and sensor readings
+        """
+        readings = []
+        for sensor in self.tof_manager.sensors:
+            readings.append({
+                'angle_degrees': self._sensor_angles_deg[sensor.index],
+                'distance': self.tof_manager.distances_array[sensor.index]
+            })
+
+        return {
+            'position': list(self.position),
+            'angle_degrees': self._angle_deg,
+            'confidence': self.confidence,
+            'initialized': self.initialized,
+            'readings': readings
+        }
+
+    def get_continuous_sensor_data(self):
+        """
+        Get formatted sensor data for continuous monitoring output
+
+        Returns:
+            str: One-line summary of all sensor readings
+        """
+        parts = []
+        for sensor in self.tof_manager.sensors:
+            distance = self.tof_manager.distances_array[sensor.index]
+            parts.append(f"{self._sensor_angles_deg[sensor.index]:6.1f}°: {distance:4.0f}mm")
+        return " | ".join(parts)
+
+    def test_localization_system(self):
+        """
+        Run a diagnostic over a set of known test positions
+
+        Ray-casts expected wall distances from each test position and reports
+        them alongside the current measured distances.
+
+        Returns:
+            dict: Expected distances per test position
+        """
+        # The test positions and walls are static, so the expected distances
+        # depend only on the heading - cache per quantized angle
+        angle_key = round(self._angle_deg)
+        if angle_key in self._test_position_cache:
+            return self._test_position_cache[angle_key]
+
+        test_positions = [
+            [self.field_width / 2, self.field_height / 2],  # Field center
+            [300, 300],                                       # Bottom-left area
+            [self.field_width - 300, 300],                    # Bottom-right area
+            [300, self.field_height - 300],                   # Top-left area
+            [self.field_width - 300, self.field_height - 300] # Top-right area
+        ]
+
+        results = {}
+        for position in test_positions:
+            distances = self._cast_sensor_rays(position)
+            expected = []
+            for sensor in self.tof_manager.sensors:
+                distance = distances[sensor.index]
+                expected.append({
+                    'angle_degrees': self._sensor_angles_deg[sensor.index],
+                    'expected_distance': float(distance) if np.isfinite(distance) else None
+                })
+            results[f"({position[0]:.0f}, {position[1]:.0f})"] = expected
+
+        self._test_position_cache[angle_key] = results
+        return results
+
+
+# Test code
+if __name__ == "__main__":
+    from tof_sensor import TOFManager
+
+    print("Testing localization system...")
+
+    try:
+        tof_manager = TOFManager()
+
+        if tof_manager.get_sensor_count() == 0:
+            print("No TOF sensors found!")
+            exit(1)
+
+        localizer = Localizer(tof_manager)
+
+        localizer.start_background_localization()
+
+        print("Running localization (press Ctrl+C to stop)...")
+        while True:
+            position, angle, confidence = localizer.get_position()
+            print(f"Position: ({position[0]:.0f}, {position[1]:.0f}) mm, "
+                  f"confidence: {confidence:.2f}")
+            time.sleep(localizer.update_frequency)
+
+    except KeyboardInterrupt:
+        print("\nStopping localization test...")
+        localizer.stop_background_localization()
+    except Exception as e:
+        print(f"Error in localization test: {e}")
@@ -5,6 +5,7 @@ Handles BLDC motor initialization, configuration, and control
 
 import time
 import sys
+import numpy as np
 from steelbar_powerful_bldc_driver import PowerfulBLDCDriver
 from config import MOTOR_CONFIG
 
@@ -21,7 +22,11 @@ class MotorController:
         """
         self.i2c = i2c_bus
         self.motors = []
-        self.motor_modes = []
+        self.motor_modes = np.zeros(0, dtype=np.int8)
+
+        # Direct motor bindings for the unrolled 4-motor fast path,
+        # populated by setup_motors
+        self._m0 = self._m1 = self._m2 = self._m3 = None
         
         # Motor parameters from config
         self.max_speed = MOTOR_CONFIG["max_speed"]
@@ -87,7 +92,9 @@ class MotorController:
                 while not motor.is_calibration_finished():
                     print(".", end="")
                     sys.stdout.flush()
-                    time.sleep(0.001)
+                    # 10 ms matches Linux timer granularity; 1 ms just
+                    # burns CPU on extra wakeups during calibration
+                    time.sleep(0.01)
                 print()
                 print(f"  elecangleoffset: {motor.get_calibration_ELECANGLEOFFSET()}")
                 print(f"  sincoscentre: {motor.get_calibration_SINCOSCENTRE()}")
@@ -105,8 +112,16 @@ class MotorController:
             motor.configure_command_mode(MOTOR_CONFIG["final_command_mode"])
             
             self.motors.append(motor)
-            self.motor_modes.append(12)
-        
+
+        # All motors run command mode 12; a typed array keeps the modes in
+        # one compact block instead of a list of boxed ints
+        self.motor_modes = np.full(len(self.motors), 12, dtype=np.int8)
+
+        # The standard drive has exactly four motors - bind them once so
+        # the per-tick speed writes skip list iteration entirely
+        if len(self.motors) == 4:
+            self._m0, self._m1, self._m2, self._m3 = self.motors
+
         print(f"initialized {len(self.motors)} motors")
     
     def set_motor_speeds(self, speeds):
@@ -116,7 +131,13 @@ class MotorController:
         Args:
             speeds: List of speeds for each motor [back_left, back_right, front_left, front_right]
         """
-        if len(self.motors) >= 4 and len(speeds) >= 4:
+        if self._m0 is not None and len(speeds) >= 4:
+            # Unrolled fast path for the standard 4-motor drive
+            self._m0.set_speed(speeds[0])
+            self._m1.set_speed(speeds[1])
+            self._m2.set_speed(speeds[2])
+            self._m3.set_speed(speeds[3])
+        elif len(self.motors) >= 4 and len(speeds) >= 4:
             for i, speed in enumerate(speeds):
                 self.motors[i].set_speed(speed)
     
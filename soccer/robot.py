@@ -4,6 +4,8 @@ Orchestrates all modules and provides the main control loop
 """
 
 import time
+import queue
+import threading
 import board
 import busio
 from camera import Camera
@@ -46,19 +48,94 @@ class SoccerRobot:
         # Initialize IMU relative heading
         if self.imu_sensor.is_available():
             self.imu_sensor.initialize_relative_heading()
-        
+
+        # Camera producer thread state: capturing on its own thread lets the
+        # next frame arrive while the control loop is busy with motor I2C
+        self._frame_queue = queue.Queue(maxsize=1)
+        self._capture_running = False
+        self._capture_thread = None
+        self._capture_error = None
+
         print("Soccer Robot initialization complete!")
-    
+
+    def _capture_frames(self):
+        """Capture frames continuously, keeping only the newest"""
+        while self._capture_running:
+            try:
+                frame = self.camera.capture_frame()
+            except Exception as e:
+                # Hand the failure to the control loop - dying silently
+                # would leave run() blocked on an empty queue with the
+                # motors still at their last commanded speeds
+                self._capture_error = e
+                self._capture_running = False
+                frame = e
+            try:
+                self._frame_queue.put_nowait(frame)
+            except queue.Full:
+                # Drop the stale frame so the control loop always gets the
+                # most recent one
+                try:
+                    self._frame_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                try:
+                    self._frame_queue.put_nowait(frame)
+                except queue.Full:
+                    pass
+
+    def _get_next_frame(self):
+        """
+        Take the newest captured frame, failing loudly if capture died
+
+        Returns:
+            Frame from the capture thread
+
+        Raises:
+            RuntimeError: If the capture thread stopped or reported an error
+        """
+        while True:
+            try:
+                frame = self._frame_queue.get(timeout=1.0)
+            except queue.Empty:
+                if (self._capture_thread is None or
+                        not self._capture_thread.is_alive()):
+                    raise RuntimeError("camera capture thread is not running") \
+                        from self._capture_error
+                continue
+            if isinstance(frame, Exception):
+                raise RuntimeError("camera capture failed") from frame
+            return frame
+
+    def start_capture_thread(self):
+        """Start capturing camera frames on a background thread"""
+        if self._capture_thread is not None and self._capture_thread.is_alive():
+            return
+        self._capture_error = None
+        self._capture_running = True
+        self._capture_thread = threading.Thread(target=self._capture_frames, daemon=True)
+        self._capture_thread.start()
+
+    def stop_capture_thread(self):
+        """Stop the background capture thread"""
+        self._capture_running = False
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout=1.0)
+            self._capture_thread = None
+
     def run(self):
         """Main control loop for the soccer robot"""
         print("Soccer robot starting...")
         print("Press Ctrl+C to quit")
-        
+
+        self.start_capture_thread()
+
         try:
             while True:
-                # Capture frame from camera
-                frame = self.camera.capture_frame()
-                
+                # Take the newest captured frame; the capture thread is
+                # already grabbing the next one while motors are updated
+                frame = self._get_next_frame()
+
                 # Detect ball in frame
                 ball_found, ball_center, ball_radius = self.camera.detect_ball(frame)
                 
@@ -116,6 +193,7 @@ class SoccerRobot:
     def shutdown(self):
         """Shutdown the robot and all subsystems"""
         print("Stopping motors...")
+        self.stop_capture_thread()
         self.motor_controller.stop_motors()
         
         print("Stopping camera...")
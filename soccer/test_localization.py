@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Localization Test Script
+Runs the Localizer against a mock TOF manager with synthetic wall
+distances, so the solver can be exercised (and timed) off the robot.
+"""
+
+import time
+import math
+import sys
+
+import numpy as np
+
+from localization import Localizer
+from config import TOF_CONFIG, LOCALIZATION_CONFIG
+
+
+class MockTOFSensor:
+    """Stand-in for TOFSensor carrying just the geometry the Localizer reads"""
+
+    def __init__(self, index, address, angle):
+        self.index = index
+        self.address = address
+        self.angle = angle
+        self.offset = (0, 0)
+
+    def get_angle_degrees(self):
+        return math.degrees(self.angle)
+
+
+class MockTOFManager:
+    """
+    Drop-in TOFManager replacement backed by a NumPy distance array
+
+    Distances live in the same contiguous distances_array layout the real
+    manager publishes; set_all() bulk-assigns a whole reading vector so
+    sweeps over thousands of test positions never iterate sensors in
+    Python. update_distances is a no-op - the test loop owns the data.
+    """
+
+    def __init__(self):
+        self.sensors = []
+        self.sensor_angles = []
+        for i, address in enumerate(TOF_CONFIG["addresses"]):
+            angle = math.radians(TOF_CONFIG["angles"][i])
+            self.sensors.append(MockTOFSensor(i, address, angle))
+            self.sensor_angles.append(angle)
+
+        self.distances_array = np.zeros(len(self.sensors), dtype=np.float32)
+        self.sensor_angles_array = np.array(self.sensor_angles, dtype=np.float32)
+        self.sensor_angles_deg = np.degrees(self.sensor_angles_array)
+        self.sensor_cos = np.cos(self.sensor_angles_array)
+        self.sensor_sin = np.sin(self.sensor_angles_array)
+        self.version = 0
+
+    def set_all(self, distances):
+        """Bulk-populate all sensor distances from an array-like"""
+        self.distances_array[:] = distances
+        self.version += 1
+
+    def update_distances(self, timeout=0.02):
+        """No-op: the test loop sets distances directly via set_all"""
+        pass
+
+    def get_sensor_count(self):
+        return len(self.sensors)
+
+
+def synthesize_distances(localizer, position, angle, noise_mm=0.0, rng=None):
+    """
+    Compute the distances the sensors would report from a true pose
+
+    Ray-casts every sensor against the field walls and optionally adds
+    Gaussian noise. Rays longer than the sensor range stay above
+    max_distance - exactly one past the limit - so the localizer's
+    validity mask excludes them the same way it excludes real
+    out-of-range readings; clamping them to max_distance would make the
+    solver treat saturated rays as genuine wall hits.
+    """
+    out_of_range = localizer.max_distance + 1
+    expected = np.asarray(localizer._cast_sensor_rays(position, angle),
+                          dtype=np.float64)
+    expected[~np.isfinite(expected)] = out_of_range
+    if noise_mm > 0.0:
+        rng = rng if rng is not None else np.random.default_rng()
+        expected = expected + rng.normal(0.0, noise_mm, expected.shape)
+    return np.clip(expected, localizer.min_distance, out_of_range)
+
+
+def pose_is_identifiable(localizer, true_pos, grid, min_separation=60.0,
+                         exclusion=300.0):
+    """
+    Check whether the current readings pin down the pose
+
+    With 1000 mm sensor range on a 2430 mm field, many poses see only one
+    or two walls and the readings match a whole line of positions. A pose
+    counts as identifiable only when every grid cell far from it (and
+    from its 180°-rotated twin) scores clearly worse than the true pose.
+    """
+    X, Y = grid
+    errors = localizer._calculate_position_error_grid(X, Y)
+    if errors is None:
+        return False
+    twin = (localizer.field_width - true_pos[0],
+            localizer.field_height - true_pos[1])
+    far = ((np.hypot(X - true_pos[0], Y - true_pos[1]) > exclusion) &
+           (np.hypot(X - twin[0], Y - twin[1]) > exclusion))
+    return float(np.nanmin(np.where(far, errors, np.inf))) > min_separation
+
+
+def run_tracking(noise_mm=0.0, ticks=30):
+    """
+    Run one Localizer across many consecutive frames and check tracking
+
+    The sweep builds a fresh Localizer per pose, so it never exercises the
+    frame-to-frame state: the EKF predict, the warm-start seed fed by
+    _last_delta, and the smoothing history. A bad inter-frame delta shows
+    up here as the estimate walking away from a stationary robot (into
+    the y±1135 corridor alias) even though every single-frame fix is fine.
+
+    Two scenarios, both deterministic:
+      - stationary: the same scene every tick must converge, not drift,
+        across several forced re-localization cycles
+      - moving: a slow straight-line run through the goal-box region
+        (the only part of the field a single frame pins down) must stay
+        within a bounded lag of the true pose
+
+    Args:
+        noise_mm: Gaussian noise sigma added to the synthetic distances
+        ticks: Number of consecutive frames per scenario
+
+    Returns:
+        tuple: (stationary position error in mm at the final tick,
+            worst moving position error in mm after settling)
+    """
+    rng = np.random.default_rng(7)
+
+    mock = MockTOFManager()
+    reference = Localizer(mock)  # Used only to synthesize distances
+
+    # Stationary robot at an identifiable pose (cold acquisition at an
+    # ambiguous one may legitimately settle in an alias basin): repeated
+    # fixes of the same scene must stay put
+    true_pos = [1000.0, 800.0]
+    localizer = Localizer(mock)
+    localizer.angle = 0.0
+    for _ in range(ticks):
+        mock.set_all(synthesize_distances(
+            reference, true_pos, 0.0, noise_mm, rng))
+        estimate = localizer.localize()
+    stationary_error = math.hypot(estimate[0] - true_pos[0],
+                                  estimate[1] - true_pos[1])
+
+    # Moving robot: constant slow drive through the identifiable region
+    # between the goal walls. The first few ticks are acquisition; after
+    # that the estimate may lag the truth but must not diverge from it.
+    localizer = Localizer(mock)
+    localizer.angle = 0.0
+    x, y = 1040.0, 760.0
+    errors = []
+    for _ in range(ticks):
+        mock.set_all(synthesize_distances(
+            reference, [x, y], 0.0, noise_mm, rng))
+        estimate = localizer.localize()
+        errors.append(math.hypot(estimate[0] - x, estimate[1] - y))
+        x += 10.0
+        y += 10.0
+    moving_error = max(errors[5:])
+
+    print(f"  Stationary error:      {stationary_error:6.1f} mm "
+          f"after {ticks} ticks")
+    print(f"  Moving error:          {moving_error:6.1f} mm max "
+          f"after settling")
+
+    return stationary_error, moving_error
+
+
+def run_sweep(noise_mm=0.0, grid_step=400, heading_deg=0.0):
+    """
+    Sweep true positions across the field and check the localizer
+
+    Two criteria, because the sensor range leaves most mid-field poses
+    underdetermined:
+      - everywhere: the solver's residual at its estimate must not be
+        meaningfully worse than the residual at the true pose
+      - at identifiable poses only: the estimate (or its symmetric twin)
+        must land within tolerance of the truth
+
+    Args:
+        noise_mm: Gaussian noise sigma added to the synthetic distances
+        grid_step: Spacing of true test positions in mm
+        heading_deg: Fixed robot heading for the sweep in degrees
+
+    Returns:
+        tuple: (worst residual excess in mm, worst identifiable-pose
+            position error in mm)
+    """
+    field_w = LOCALIZATION_CONFIG["field_width"]
+    field_h = LOCALIZATION_CONFIG["field_height"]
+    heading = math.radians(heading_deg)
+    rng = np.random.default_rng(42)
+
+    mock = MockTOFManager()
+    reference = Localizer(mock)  # Used only to synthesize distances
+
+    # Shared evaluation grid for the identifiability check
+    step = 50.0
+    amb_grid = np.meshgrid(np.arange(step, field_w, step),
+                           np.arange(step, field_h, step))
+
+    total = 0
+    identifiable = 0
+    worst_residual = 0.0
+    pos_errors = []
+    start = time.monotonic()
+
+    margin = 200  # Keep true positions off the walls
+    for true_x in range(margin, int(field_w) - margin + 1, grid_step):
+        for true_y in range(margin, int(field_h) - margin + 1, grid_step):
+            true_pos = [float(true_x), float(true_y)]
+            mock.set_all(synthesize_distances(
+                reference, true_pos, heading, noise_mm, rng))
+
+            # Fresh localizer per position: measures cold acquisition
+            # rather than tracking from the previous test point
+            localizer = Localizer(mock)
+            localizer.angle = heading
+            estimate = localizer.localize()
+            total += 1
+
+            # Solver optimality: the estimate must explain the readings
+            # at least as well as the truth does (small slack for the
+            # annealer's budget)
+            residual_est = localizer._calculate_position_error(estimate)
+            residual_true = localizer._calculate_position_error(true_pos)
+            if residual_est is not None and residual_true is not None:
+                worst_residual = max(worst_residual,
+                                     residual_est - residual_true)
+
+            if not pose_is_identifiable(localizer, true_pos, amb_grid):
+                continue
+            identifiable += 1
+
+            # The field is symmetric under 180° rotation and the sensor
+            # ring is evenly spaced, so a pose and its rotated twin give
+            # identical TOF signatures; on the robot the IMU and motion
+            # history pick the right one. Score against the closer of
+            # the two equivalent poses.
+            twin = [field_w - true_pos[0], field_h - true_pos[1]]
+            pos_errors.append(min(
+                math.hypot(estimate[0] - true_pos[0],
+                           estimate[1] - true_pos[1]),
+                math.hypot(estimate[0] - twin[0],
+                           estimate[1] - twin[1])))
+
+    elapsed = time.monotonic() - start
+    worst_pos = max(pos_errors) if pos_errors else 0.0
+
+    print(f"  Positions tested:     {total} "
+          f"({identifiable} identifiable from a single frame)")
+    print(f"  Worst residual excess: {worst_residual:6.1f} mm")
+    if pos_errors:
+        print(f"  Position error:        {np.mean(pos_errors):6.1f} mm mean, "
+              f"{worst_pos:6.1f} mm max over identifiable poses")
+    print(f"  Total time:            {elapsed:6.2f} s "
+          f"({elapsed / total * 1000:.1f} ms per fix)")
+
+    return worst_residual, worst_pos
+
+
+def main():
+    """Run the localization test sweeps"""
+    print("Localization Test")
+    print("=================")
+
+    print("\n📐 Noise-free sweep:")
+    clean_residual, clean_pos = run_sweep(noise_mm=0.0)
+
+    print("\n📡 Noisy sweep (30 mm sensor sigma):")
+    noisy_residual, noisy_pos = run_sweep(noise_mm=30.0)
+
+    print("\n🏃 Noise-free tracking:")
+    clean_stat, clean_track = run_tracking(noise_mm=0.0)
+
+    print("\n🏃 Noisy tracking (30 mm sensor sigma):")
+    noisy_stat, noisy_track = run_tracking(noise_mm=30.0)
+
+    residual_tolerance = 40   # mm of slack over the true-pose residual
+    position_tolerance = 100  # mm at identifiable poses
+    stationary_tolerance = 100  # mm after repeated fixes of one scene
+    tracking_tolerance = 300    # mm of lag behind a moving robot
+    if (clean_residual < residual_tolerance and
+            noisy_residual < residual_tolerance and
+            clean_pos < position_tolerance and
+            noisy_pos < 2 * position_tolerance and
+            clean_stat < stationary_tolerance and
+            noisy_stat < stationary_tolerance and
+            clean_track < tracking_tolerance and
+            noisy_track < tracking_tolerance):
+        print("\n✅ Localization within tolerance")
+        return 0
+
+    print("\n❌ Localization error above tolerance")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
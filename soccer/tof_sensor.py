@@ -3,12 +3,20 @@ Time-of-Flight (TOF) sensor module for the Soccer Robot
 Handles VL53L0X TOF sensors for distance measurement
 """
 
+import sys
 import time
 import math
+import struct
+import threading
 import board
 import busio
+import numpy as np
 from config import TOF_CONFIG
 
+# Sensor frame layout: one sequence byte followed by a little-endian
+# uint32 distance; a prebound Struct decodes it in a single C call
+_FRAME = struct.Struct("<BI")
+
 
 class TOFSensor:
     """Handles VL53L0X TOF sensor for distance measurement"""
@@ -26,6 +34,8 @@ class TOFSensor:
         self.address = address
         self.offset = offset
         self.angle = angle
+        self.angle_degrees = math.degrees(angle)  # Cached; geometry never changes
+        self.index = None  # Position in the manager's sensor list, set by TOFManager
         self.i2c = i2c_bus if i2c_bus is not None else busio.I2C(board.SCL, board.SDA)
         
         # Distance limits from config
@@ -36,6 +46,11 @@ class TOFSensor:
         # State tracking
         self.last_seq = None
         self.last_distance = 0
+
+        # Reusable I2C buffers - allocating fresh bytes/bytearray objects
+        # for every read showed up as steady garbage-collector churn
+        self._read_cmd = bytes([self.read_register])
+        self._read_buf = bytearray(5)
         
         # Initialize sensor
         self.setup_sensor()
@@ -54,57 +69,51 @@ class TOFSensor:
         """Test I2C communication with the sensor"""
         try:
             # Try to read from the sensor
-            write_buf = bytes([self.read_register])
-            read_buf = bytearray(5)
-            self.i2c.writeto(self.address, write_buf)
-            self.i2c.readfrom_into(self.address, read_buf)
+            self.i2c.writeto_then_readfrom(self.address, self._read_cmd, self._read_buf)
         except Exception as e:
             raise Exception(f"I2C communication failed: {e}")
     
     def _read_distance(self, wait_for_new=True):
         """
-        Read distance from TOF sensor
-        
+        Read distance from TOF sensor without blocking
+
+        Issues one transaction and returns the freshest value the sensor
+        has; if no new sample is ready yet the previous reading comes back.
+        The old spin-until-the-sequence-advances loop serialized every
+        update cycle on the slowest sensor.
+
         Args:
-            wait_for_new: If True, wait for new data point
-            
+            wait_for_new: Kept for API compatibility; reads never block
+
         Returns:
             int: Distance in mm
         """
-        write_buf = bytes([self.read_register])
-        read_buf = bytearray(5)
-        
-        while True:
-            try:
-                self.i2c.writeto(self.address, write_buf)
-                self.i2c.readfrom_into(self.address, read_buf)
-                
-                # Extract sequence number and distance
-                seq = read_buf[0]
-                distance = (read_buf[1] | read_buf[2] << 8 | 
-                           read_buf[3] << 16 | read_buf[4] << 24)
-                
-                # Check if this is new data
-                changed = seq != self.last_seq
-                
-                # If we want fresh data and this isn't new, continue
-                if changed or not wait_for_new:
-                    self.last_seq = seq
-                    
-                    # Validate distance
-                    if (self.min_distance <= distance <= self.max_distance):
-                        self.last_distance = distance
-                    # If distance is invalid, return last valid distance
-                    
-                    return self.last_distance
-                
-                # Small delay to avoid busy waiting
-                time.sleep(0.00001)
-                
-            except Exception as e:
-                print(f"Error reading TOF sensor at 0x{self.address:02x}: {e}")
-                return self.last_distance
+        distance, _ = self.read_distance_nowait()
+        return distance
     
+    def read_distance_nowait(self):
+        """
+        Issue a single non-blocking distance read
+
+        Returns:
+            tuple: (distance in mm, True if this was a fresh sample)
+        """
+        try:
+            self.i2c.writeto_then_readfrom(self.address, self._read_cmd, self._read_buf)
+        except Exception as e:
+            print(f"Error reading TOF sensor at 0x{self.address:02x}: {e}")
+            return self.last_distance, False
+
+        seq, distance = _FRAME.unpack_from(self._read_buf)
+
+        fresh = seq != self.last_seq
+        if fresh:
+            self.last_seq = seq
+            if self.min_distance <= distance <= self.max_distance:
+                self.last_distance = distance
+
+        return self.last_distance, fresh
+
     def get_distance(self, wait_for_new=True):
         """
         Get current distance measurement
@@ -124,7 +133,7 @@ class TOFSensor:
         Returns:
             float: Angle in degrees
         """
-        return math.degrees(self.angle)
+        return self.angle_degrees
     
     def get_offset(self):
         """
@@ -161,8 +170,16 @@ class TOFManager:
         self.i2c = i2c_bus if i2c_bus is not None else busio.I2C(board.SCL, board.SDA)
         self.sensors = []
         self.sensor_angles = []
-        self.sensor_distances = {}
-        
+        self._angle_index = {}
+        self.distances_array = np.zeros(0, dtype=np.float32)
+        self.filter_alpha = 0.3  # EMA weight for new distance readings
+        self.version = 0         # Bumped on every distance refresh
+
+        # Background polling thread state
+        self._poll_running = False
+        self._poll_thread = None
+        self._poll_ident = None
+
         # Initialize sensors from config
         self.setup_sensors()
     
@@ -187,23 +204,132 @@ class TOFManager:
                     i2c_bus=self.i2c
                 )
                 
+                sensor.index = len(self.sensors)
                 self.sensors.append(sensor)
                 self.sensor_angles.append(angle_radians)
-                self.sensor_distances[angle_radians] = 0  # Initialize with 0
-                
+                self._angle_index[angle_radians] = sensor.index
+
                 print(f"  ✅ TOF sensor at 0x{address:02x}, angle {angle_degrees}°")
-                
+
             except Exception as e:
                 print(f"  ❌ Failed to initialize TOF at 0x{address:02x}: {e}")
-        
+
+        # Contiguous distance storage indexed by sensor.index
+        # float32 is plenty for mm-scale distances and halves memory traffic
+        self.distances_array = np.zeros(len(self.sensors), dtype=np.float32)
+
+        # Structure-of-arrays views of the fixed sensor geometry, indexed by
+        # sensor ordinal - consumers that sweep all sensors (localizer
+        # kernels, telemetry) read these instead of walking the object list
+        self.sensor_angles_array = np.array(self.sensor_angles, dtype=np.float32)
+        self.sensor_angles_deg = np.degrees(self.sensor_angles_array)
+        self.sensor_cos = np.cos(self.sensor_angles_array)
+        self.sensor_sin = np.sin(self.sensor_angles_array)
+
         print(f"Initialized {len(self.sensors)} TOF sensors")
+
+    def _store_distance(self, index, distance):
+        """
+        Store a distance reading through the low-pass filter
+
+        Single-ping TOF readings are noisy; an exponential moving average
+        keeps downstream consumers (localization scoring in particular)
+        stable. Out-of-range values pass through unfiltered so they stay
+        visible to validity checks without polluting the average.
+
+        Args:
+            index: Sensor index into distances_array
+            distance: New distance reading in mm
+        """
+        previous = self.distances_array[index]
+        if (self.sensors[index].is_valid_distance(distance) and
+                self.sensors[index].is_valid_distance(previous)):
+            self.distances_array[index] = previous + self.filter_alpha * (distance - previous)
+        else:
+            self.distances_array[index] = distance
+
+    def update_distances(self, timeout=0.02):
+        """
+        Update all sensor distance readings
+
+        Polls the sensors round-robin with non-blocking reads so the waits
+        for fresh samples overlap across sensors instead of serializing one
+        sensor at a time.
+
+        While the background poller is running it owns the bus: calls from
+        any other thread return immediately and the caller reads the
+        snapshot the poller keeps fresh, instead of two threads issuing
+        interleaved transactions and racing on the distance array.
+
+        Args:
+            timeout: Maximum time in seconds to wait for fresh samples
+        """
+        if self._poll_running and threading.get_ident() != self._poll_ident:
+            return
+
+        self.version += 1
+        pending = list(self.sensors)
+
+        # Hoist the bound methods out of the polling loop - it runs until
+        # every sensor answers, so the repeated LOAD_ATTRs add up
+        store_distance = self._store_distance
+        monotonic = time.monotonic
+        deadline = monotonic() + timeout
+
+        while pending:
+            still_pending = []
+            append_pending = still_pending.append
+            for sensor in pending:
+                distance, fresh = sensor.read_distance_nowait()
+                if fresh:
+                    store_distance(sensor.index, distance)
+                else:
+                    append_pending(sensor)
+            pending = still_pending
+
+            if pending and monotonic() > deadline:
+                # Fall back to the last valid reading for slow sensors
+                for sensor in pending:
+                    store_distance(sensor.index, sensor.last_distance)
+                break
     
-    def update_distances(self):
-        """Update all sensor distance readings"""
-        for sensor in self.sensors:
-            distance = sensor.get_distance(wait_for_new=True)
-            self.sensor_distances[sensor.angle] = distance
-    
+    def start_background_polling(self, interval=0.02):
+        """
+        Start refreshing distances on a background thread
+
+        Consumers then read the latest snapshot from distances_array (and
+        the version counter) without paying for I2C transactions on their
+        own loop; their own update_distances calls become no-ops while the
+        poller runs, so only one thread ever touches the bus. Same producer
+        pattern as the camera capture thread and the background localizer.
+
+        Args:
+            interval: Target seconds between refresh cycles
+        """
+        if self._poll_thread is not None and self._poll_thread.is_alive():
+            return
+        self._poll_running = True
+        self._poll_thread = threading.Thread(
+            target=self._poll_loop, args=(interval,), daemon=True)
+        self._poll_thread.start()
+
+    def stop_background_polling(self):
+        """Stop the background polling thread"""
+        self._poll_running = False
+        if self._poll_thread is not None:
+            self._poll_thread.join(timeout=1.0)
+            self._poll_thread = None
+
+    def _poll_loop(self, interval):
+        """Background loop that keeps the distance snapshot fresh"""
+        self._poll_ident = threading.get_ident()
+        while self._poll_running:
+            start = time.monotonic()
+            self.update_distances()
+            remaining = interval - (time.monotonic() - start)
+            if remaining > 0:
+                time.sleep(remaining)
+
     def get_distance_at_angle(self, angle):
         """
         Get distance measurement at specific angle
@@ -212,18 +338,22 @@ class TOFManager:
             angle: Angle in radians
             
         Returns:
-            int: Distance in mm, or 0 if no sensor at that angle
+            float: Distance in mm, or 0 if no sensor at that angle
         """
-        return self.sensor_distances.get(angle, 0)
-    
+        index = self._angle_index.get(angle)
+        if index is None:
+            return 0
+        return float(self.distances_array[index])
+
     def get_all_distances(self):
         """
         Get all distance measurements
-        
+
         Returns:
             dict: Angle -> distance mapping
         """
-        return self.sensor_distances.copy()
+        return {sensor.angle: float(self.distances_array[sensor.index])
+                for sensor in self.sensors}
     
     def get_sensor_count(self):
         """
@@ -248,7 +378,7 @@ class TOFManager:
                 'angle_degrees': sensor.get_angle_degrees(),
                 'angle_radians': sensor.angle,
                 'offset': sensor.get_offset(),
-                'distance': self.sensor_distances[sensor.angle]
+                'distance': float(self.distances_array[sensor.index])
             })
         return info
 
@@ -267,17 +397,23 @@ if __name__ == "__main__":
         
         print(f"Found {tof_manager.get_sensor_count()} TOF sensors")
         print("Reading distances (press Ctrl+C to stop)...")
-        
+
+        # Sensor geometry is fixed - convert angles to degrees once,
+        # not per sensor per tick
+        sensor_angles_deg = [(sensor.index, sensor.get_angle_degrees())
+                             for sensor in tof_manager.sensors]
+
         while True:
             # Update all distances
             tof_manager.update_distances()
-            
-            # Print current readings
-            print("\nTOF Readings:")
-            for sensor in tof_manager.sensors:
-                distance = tof_manager.sensor_distances[sensor.angle]
-                angle_deg = sensor.get_angle_degrees()
-                print(f"  Angle {angle_deg:6.1f}°: {distance:4d} mm")
+
+            # Build the whole readout and write it once - one syscall per
+            # tick instead of one per sensor
+            lines = ["\nTOF Readings:"]
+            lines.extend(
+                f"  Angle {angle_deg:6.1f}°: {tof_manager.distances_array[index]:4.0f} mm"
+                for index, angle_deg in sensor_angles_deg)
+            sys.stdout.write("\n".join(lines) + "\n")
             
             time.sleep(0.1)  # 10 Hz update rate
             
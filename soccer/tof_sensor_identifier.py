@@ -8,10 +8,21 @@ This helps identify which sensor is positioned where on the robot.
 import time
 import math
 import sys
+import io
+from contextlib import redirect_stdout
+
+import numpy as np
 
 from tof_sensor import TOFManager
 from config import TOF_CONFIG
 
+# Position labels for the eight 45° sectors, ordered from FRONT going
+# clockwise; indexed arithmetically instead of walking an if/elif ladder
+POSITION_NAMES = (
+    "FRONT", "FRONT-RIGHT", "RIGHT", "BACK-RIGHT",
+    "BACK", "BACK-LEFT", "LEFT", "FRONT-LEFT",
+)
+
 
 class TOFIdentifier:
     """TOF sensor identifier for mapping sensor positions"""
@@ -20,6 +31,9 @@ class TOFIdentifier:
         """Initialize the TOF identifier"""
         self.tof_manager = None
         self.running = False
+        self._position_names = []
+        self._map_coords = []
+        self._map_size = 20
         
     def initialize_sensors(self):
         """Initialize TOF sensors"""
@@ -31,6 +45,23 @@ class TOFIdentifier:
                 print("❌ No TOF sensors found!")
                 return False
                 
+            # Sensor angles never change - resolve the position labels once
+            # instead of re-deriving them every display frame
+            self._position_names = [self._get_position_name(sensor.get_angle_degrees())
+                                    for sensor in self.tof_manager.sensors]
+
+            # Map pixel positions depend only on the fixed sensor angles,
+            # so the trig happens once here rather than every frame
+            center = self._map_size // 2
+            scale = 8  # Scale factor for visibility
+            self._map_coords = []
+            for sensor in self.tof_manager.sensors:
+                x = center + int(scale * math.cos(sensor.angle))
+                y = center + int(scale * math.sin(sensor.angle))
+                x = max(0, min(self._map_size - 1, x))
+                y = max(0, min(self._map_size - 1, y))
+                self._map_coords.append((x, y))
+
             print(f"✅ Found {self.tof_manager.get_sensor_count()} TOF sensors")
             return True
             
@@ -47,18 +78,15 @@ class TOFIdentifier:
         """
         # Update all sensor readings
         self.tof_manager.update_distances()
-        
-        # Get all sensor info with distances
-        sensor_data = []
-        for sensor in self.tof_manager.sensors:
-            distance = self.tof_manager.sensor_distances[sensor.angle]
-            angle_deg = sensor.get_angle_degrees()
-            sensor_data.append((sensor, distance, angle_deg))
-        
-        # Sort by distance (closest first)
-        sensor_data.sort(key=lambda x: x[1])
-        
-        return sensor_data
+
+        # Rank with a C-level argsort over the shared distance array
+        # instead of a Timsort driven by a Python key function
+        distances = self.tof_manager.distances_array
+        sensors = self.tof_manager.sensors
+        order = np.argsort(distances)
+
+        return [(sensors[i], float(distances[i]), sensors[i].get_angle_degrees())
+                for i in order]
     
     def display_sensor_info(self, sensor_data):
         """
@@ -77,16 +105,16 @@ class TOFIdentifier:
             print(f"🏆 CLOSEST TO WALL:")
             print(f"   Address: 0x{closest[0].address:02x}")
             print(f"   Angle: {closest[2]:6.1f}°")
-            print(f"   Distance: {closest[1]:4d} mm")
-            print(f"   Position: {self._get_position_name(closest[2])}")
+            print(f"   Distance: {closest[1]:4.0f} mm")
+            print(f"   Position: {self._position_names[closest[0].index]}")
         
         if len(sensor_data) >= 2:
             second = sensor_data[1]
             print(f"\n🥈 SECOND CLOSEST:")
             print(f"   Address: 0x{second[0].address:02x}")
             print(f"   Angle: {second[2]:6.1f}°")
-            print(f"   Distance: {second[1]:4d} mm")
-            print(f"   Position: {self._get_position_name(second[2])}")
+            print(f"   Distance: {second[1]:4.0f} mm")
+            print(f"   Position: {self._position_names[second[0].index]}")
         
         # Show all sensors
         print(f"\n📊 ALL SENSORS (sorted by distance):")
@@ -98,8 +126,8 @@ class TOFIdentifier:
             rank = i + 1
             address = f"0x{sensor.address:02x}"
             angle_str = f"{angle_deg:6.1f}°"
-            distance_str = f"{distance:4d} mm"
-            position = self._get_position_name(angle_deg)
+            distance_str = f"{distance:4.0f} mm"
+            position = self._position_names[sensor.index]
             
             # Determine status
             if distance < 100:
@@ -123,27 +151,9 @@ class TOFIdentifier:
         Returns:
             str: Position name
         """
-        # Normalize angle to 0-360 range
-        angle = angle_deg % 360
-        
-        if 337.5 <= angle or angle < 22.5:
-            return "FRONT"
-        elif 22.5 <= angle < 67.5:
-            return "FRONT-RIGHT"
-        elif 67.5 <= angle < 112.5:
-            return "RIGHT"
-        elif 112.5 <= angle < 157.5:
-            return "BACK-RIGHT"
-        elif 157.5 <= angle < 202.5:
-            return "BACK"
-        elif 202.5 <= angle < 247.5:
-            return "BACK-LEFT"
-        elif 247.5 <= angle < 292.5:
-            return "LEFT"
-        elif 292.5 <= angle < 337.5:
-            return "FRONT-LEFT"
-        else:
-            return "UNKNOWN"
+        # Shift by half a sector so each 45° bucket maps straight to a
+        # table index - no comparison ladder
+        return POSITION_NAMES[int(((angle_deg + 22.5) % 360) // 45) % 8]
     
     def display_simple_info(self, sensor_data):
         """
@@ -154,7 +164,7 @@ class TOFIdentifier:
         """
         if len(sensor_data) >= 1:
             closest = sensor_data[0]
-            print(f"Closest: 0x{closest[0].address:02x} - {closest[1]:4d}mm - {closest[2]:6.1f}°")
+            print(f"Closest: 0x{closest[0].address:02x} - {closest[1]:4.0f}mm - {closest[2]:6.1f}°")
         else:
             print("No sensors available")
     
@@ -170,29 +180,20 @@ class TOFIdentifier:
         print("="*60)
         
         # Create a simple ASCII map
-        map_size = 20
+        map_size = self._map_size
         center = map_size // 2
-        
+
         # Initialize map
         visual_map = [[' ' for _ in range(map_size)] for _ in range(map_size)]
-        
+
         # Place robot center
         visual_map[center][center] = 'R'
-        
-        # Place sensors on the map
+
+        # Place sensors on the map using the pixel positions precomputed
+        # at startup - only the marker depends on the live distance
         for sensor, distance, angle_deg in sensor_data:
-            # Convert angle to radians
-            angle_rad = math.radians(angle_deg)
-            
-            # Calculate position on map (scaled)
-            scale = 8  # Scale factor for visibility
-            x = center + int(scale * math.cos(angle_rad))
-            y = center + int(scale * math.sin(angle_rad))
-            
-            # Clamp to map bounds
-            x = max(0, min(map_size-1, x))
-            y = max(0, min(map_size-1, y))
-            
+            x, y = self._map_coords[sensor.index]
+
             # Place sensor marker
             if distance < 200:
                 visual_map[y][x] = '●'  # Close sensor
@@ -222,18 +223,30 @@ class TOFIdentifier:
         print(f"📊 Update interval: {update_interval}s")
         print(f"🛑 Press Ctrl+C to stop")
         
+        last_frame_key = None
+
         try:
             while self.running:
                 # Get sensor rankings
                 sensor_data = self.get_sensor_ranking()
-                
-                # Display information
-                self.display_sensor_info(sensor_data)
-                self.display_visual_map(sensor_data)
-                
+
+                # Skip the redraw when no sensor moved more than 5 mm -
+                # terminal writes dominate the loop when nothing changes
+                frame_key = (self.tof_manager.distances_array // 5).astype(np.int32).tobytes()
+                if frame_key != last_frame_key:
+                    last_frame_key = frame_key
+
+                    # Render the whole frame into one buffer and write it
+                    # with a single syscall instead of a print per line
+                    buffer = io.StringIO()
+                    with redirect_stdout(buffer):
+                        self.display_sensor_info(sensor_data)
+                        self.display_visual_map(sensor_data)
+                    sys.stdout.write(buffer.getvalue())
+
                 # Wait for next update
                 time.sleep(update_interval)
-                
+
         except KeyboardInterrupt:
             print(f"\n🛑 Stopping TOF monitoring...")
             self.running = False